@@ -0,0 +1,22 @@
+"""JSON encoding helpers, using orjson when it is installed."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install "check-cli[fast]"
+    orjson = None
+
+
+def dumps(data) -> bytes:
+    """Serialize data to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
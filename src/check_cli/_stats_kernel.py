@@ -0,0 +1,50 @@
+"""Numba-compiled reduction for statistics over long histories.
+
+Numba and NumPy are optional (pip install "check-cli[jit]"); when they are
+not installed AVAILABLE is False and callers use their pure-Python path.
+
+Importing Numba is slow, so callers import this module lazily and only for
+histories large enough to benefit.
+"""
+
+from typing import List, Sequence
+
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+    np = None
+
+AVAILABLE = numba is not None
+
+
+if AVAILABLE:
+
+    @numba.njit(cache=True)
+    def _reduce(arr):
+        n_rows, n_metrics = arr.shape
+        out = np.zeros((n_metrics, 4))
+        for j in range(n_metrics):
+            out[j, 1] = np.inf
+            out[j, 2] = -np.inf
+        for i in range(n_rows):
+            for j in range(n_metrics):
+                value = arr[i, j]
+                if value == value:  # Skip NaN (missing values)
+                    out[j, 0] += value
+                    if value < out[j, 1]:
+                        out[j, 1] = value
+                    if value > out[j, 2]:
+                        out[j, 2] = value
+                    out[j, 3] += 1
+        return out
+
+
+def reduce_metrics(records: Sequence[dict], metrics: Sequence[str]) -> List[list]:
+    """Return [sum, min, max, count] for each metric across raw history records.
+
+    Only call this when AVAILABLE is True.
+    """
+    arr = np.array([[r.get(m) for m in metrics] for r in records], dtype=np.float64)
+    return [[float(v) for v in row[:3]] + [int(row[3])] for row in _reduce(arr)]
@@ -0,0 +1,35 @@
+"""CLI subcommands, each in its own module so it is only imported when invoked."""
+
+import click
+
+from ..display import console, progress_session
+
+
+def _no_progress(phase: str, value: float, detail: str = ""):
+    """Progress callback used when output is not a terminal."""
+
+
+def run_with_progress(test_func, description: str, session=None):
+    """Run a test function with a progress display.
+    
+    Pass a session from progress_session() to reuse one display across tests.
+    """
+    # Piped or scheduled runs have no one watching the progress bar
+    if not console.is_terminal:
+        return test_func(_no_progress)
+    
+    if session is None:
+        with progress_session() as session:
+            return run_with_progress(test_func, description, session)
+    
+    _, new_callback = session
+    return test_func(new_callback())
+
+
+repeat_option = click.option(
+    "--repeat",
+    "-r",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Run the test this many times in a row.",
+)
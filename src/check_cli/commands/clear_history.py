@@ -0,0 +1,17 @@
+"""The `check clear-history` command."""
+
+import click
+
+from ..display import print_success
+from ..history import clear_history
+
+
+@click.command("clear-history")
+@click.confirmation_option(prompt="Are you sure you want to clear all history?")
+def clear_history_cmd():
+    """Clear all test history.
+    
+    This will permanently delete all saved test results.
+    """
+    clear_history()
+    print_success("History cleared.")
@@ -0,0 +1,47 @@
+"""The `check dns` command."""
+
+import asyncio
+
+import click
+from rich.panel import Panel
+
+from ..display import console, format_dns, print_banner, print_error, print_info, print_success
+from ..speedtest import CloudflareSpeedTest
+
+
+@click.command()
+def dns():
+    """Test DNS lookup time.
+    
+    Measures how long it takes to resolve speed.cloudflare.com.
+    Fast DNS is important for browsing responsiveness.
+    """
+    print_banner()
+    print_info("Testing DNS lookup time...")
+    console.print()
+    
+    try:
+        tester = CloudflareSpeedTest()
+        dns_time = asyncio.run(tester.measure_dns())
+        
+        panel = Panel(
+            format_dns(dns_time),
+            title="[bold cyan]DNS Lookup Time[/bold cyan]",
+            border_style="cyan",
+        )
+        console.print(panel)
+        console.print()
+        
+        # Provide context
+        if dns_time < 20:
+            print_success("Excellent DNS response time!")
+        elif dns_time < 50:
+            print_info("Good DNS response time.")
+        elif dns_time < 100:
+            console.print("[yellow]DNS is a bit slow. Consider using a faster DNS like 1.1.1.1 or 8.8.8.8[/yellow]")
+        else:
+            console.print("[red]DNS is slow. Try switching to Cloudflare DNS (1.1.1.1) or Google DNS (8.8.8.8)[/red]")
+        
+    except Exception as e:
+        print_error(f"DNS test failed: {e}")
+        raise click.Abort()
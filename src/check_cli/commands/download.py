@@ -0,0 +1,44 @@
+"""The `check download` command."""
+
+import click
+
+from ..display import (
+    console,
+    display_result,
+    print_banner,
+    print_error,
+    print_info,
+    progress_session,
+)
+from ..history import History
+from ..speedtest import run_download_test
+from . import repeat_option, run_with_progress
+
+
+@click.command()
+@click.option("--no-save", is_flag=True, help="Don't save result to history.")
+@repeat_option
+def download(no_save, repeat):
+    """Test download speed only.
+    
+    Measures your download bandwidth by fetching files of various sizes
+    from Cloudflare's servers.
+    """
+    print_banner()
+    print_info("Testing download speed...")
+    console.print()
+    
+    try:
+        with progress_session() as session:
+            for _ in range(repeat):
+                result = run_with_progress(run_download_test, "Testing download", session)
+                
+                if not no_save:
+                    with History() as h:
+                        h.append(result)
+                
+                display_result(result)
+        
+    except Exception as e:
+        print_error(f"Download test failed: {e}")
+        raise click.Abort()
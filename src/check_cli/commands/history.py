@@ -0,0 +1,34 @@
+"""The `check history` command."""
+
+import click
+
+from .. import __version__
+from ..display import console, display_history, print_banner, print_cached_render
+from ..history import get_history_fingerprint, get_last_n_records, get_render_cache_path
+
+
+@click.command()
+@click.option(
+    "-n",
+    "--count",
+    default=10,
+    type=click.IntRange(min=1),
+    help="Number of results to show.",
+)
+def history(count):
+    """View past speed test results.
+    
+    Shows a table of your previous speed tests with all metrics.
+    """
+    print_banner()
+    
+    fingerprint = get_history_fingerprint()
+    if fingerprint is None:
+        display_history([])
+        return
+    
+    # Re-running with unchanged history and terminal settings replays the last render
+    cache_path = get_render_cache_path()
+    cache_key = f"{__version__}:{fingerprint}:{count}:{console.width}:{console.color_system}"
+    if not print_cached_render(cache_path, cache_key):
+        display_history(get_last_n_records(count), cache_path, cache_key)
@@ -0,0 +1,35 @@
+"""The `check jitter` command."""
+
+import click
+
+from ..display import console, display_result, print_banner, print_error, print_info
+from ..history import History
+from ..speedtest import run_latency_test
+from . import run_with_progress
+
+
+@click.command()
+@click.option("--no-save", is_flag=True, help="Don't save result to history.")
+def jitter(no_save):
+    """Test jitter only (alias for latency command).
+    
+    Jitter is measured alongside latency, so this runs the same test
+    as the latency command.
+    """
+    # Jitter is measured with latency
+    print_banner()
+    print_info("Testing jitter (and latency)...")
+    console.print()
+    
+    try:
+        result = run_with_progress(run_latency_test, "Testing jitter")
+        
+        if not no_save:
+            with History() as h:
+                h.append(result)
+        
+        display_result(result)
+        
+    except Exception as e:
+        print_error(f"Jitter test failed: {e}")
+        raise click.Abort()
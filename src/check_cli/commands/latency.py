@@ -0,0 +1,44 @@
+"""The `check latency` command."""
+
+import click
+
+from ..display import (
+    console,
+    display_result,
+    print_banner,
+    print_error,
+    print_info,
+    progress_session,
+)
+from ..history import History
+from ..speedtest import run_latency_test
+from . import repeat_option, run_with_progress
+
+
+@click.command()
+@click.option("--no-save", is_flag=True, help="Don't save result to history.")
+@repeat_option
+def latency(no_save, repeat):
+    """Test latency and jitter only.
+    
+    Measures network latency (ping) and jitter (variation in latency)
+    to Cloudflare's servers.
+    """
+    print_banner()
+    print_info("Testing latency and jitter...")
+    console.print()
+    
+    try:
+        with progress_session() as session:
+            for _ in range(repeat):
+                result = run_with_progress(run_latency_test, "Testing latency", session)
+                
+                if not no_save:
+                    with History() as h:
+                        h.append(result)
+                
+                display_result(result)
+        
+    except Exception as e:
+        print_error(f"Latency test failed: {e}")
+        raise click.Abort()
@@ -0,0 +1,65 @@
+"""The `check quality` command."""
+
+import click
+from rich.panel import Panel
+from rich.text import Text
+
+from ..display import console, display_result, print_banner, print_error, print_info
+from ..history import History
+from ..speedtest import run_speed_test
+from . import run_with_progress
+
+
+@click.command()
+def quality():
+    """Show connection quality score only.
+    
+    Runs a full test but emphasizes the overall quality score,
+    which is calculated from download, upload, latency, and jitter.
+    """
+    print_banner()
+    print_info("Calculating connection quality...")
+    console.print()
+    
+    try:
+        result = run_with_progress(run_speed_test, "Testing quality")
+        with History() as h:
+            h.append(result)
+        
+        # Show quality-focused output
+        quality = result.quality_score or 0
+        if quality >= 90:
+            color = "green"
+            verdict = "Excellent! Your connection is top-tier."
+        elif quality >= 70:
+            color = "green"
+            verdict = "Good. Your connection handles most tasks well."
+        elif quality >= 50:
+            color = "yellow"
+            verdict = "Fair. You may experience some issues with video calls or gaming."
+        elif quality >= 30:
+            color = "rgb(255,165,0)"
+            verdict = "Poor. Consider troubleshooting your connection."
+        else:
+            color = "red"
+            verdict = "Bad. Your connection needs attention."
+        
+        score_text = Text()
+        score_text.append(f"\n  {quality}", style=f"bold {color}")
+        score_text.append("/100\n\n", style="dim")
+        score_text.append(f"  {verdict}\n", style=color)
+        
+        panel = Panel(
+            score_text,
+            title="[bold cyan]Connection Quality Score[/bold cyan]",
+            border_style="cyan",
+        )
+        console.print(panel)
+        console.print()
+        
+        # Also show the detailed results
+        display_result(result)
+        
+    except Exception as e:
+        print_error(f"Quality test failed: {e}")
+        raise click.Abort()
@@ -0,0 +1,62 @@
+"""The `check speed` command."""
+
+import click
+
+from ..display import (
+    console,
+    display_comparison,
+    display_result,
+    print_banner,
+    print_error,
+    print_info,
+    print_success,
+    progress_session,
+)
+from ..history import History, compare_results
+from ..speedtest import run_speed_test
+from . import repeat_option, run_with_progress
+
+
+@click.command()
+@click.option("--no-save", is_flag=True, help="Don't save result to history.")
+@click.option("--no-compare", is_flag=True, help="Don't compare with previous result.")
+@repeat_option
+def speed(no_save, no_compare, repeat):
+    """Run a full speed test (download, upload, latency, jitter).
+    
+    This is the most comprehensive test that measures all aspects of your
+    internet connection.
+    """
+    print_banner()
+    print_info("Starting full speed test...")
+    console.print()
+    
+    try:
+        with progress_session() as session:
+            for _ in range(repeat):
+                result = run_with_progress(run_speed_test, "Running speed test", session)
+                
+                with History() as h:
+                    # Get previous result for comparison
+                    previous = h.last() if not no_compare else None
+                    
+                    # Save result
+                    if not no_save:
+                        h.append(result)
+                
+                if not no_save:
+                    print_success("Result saved to history")
+                
+                # Display result
+                if previous and not no_compare:
+                    comparison = compare_results(result, previous)
+                    if comparison:
+                        display_comparison(result, comparison)
+                    else:
+                        display_result(result)
+                else:
+                    display_result(result)
+            
+    except Exception as e:
+        print_error(f"Speed test failed: {e}")
+        raise click.Abort()
@@ -0,0 +1,18 @@
+"""The `check stats` command."""
+
+import click
+
+from ..display import display_statistics, print_banner
+from ..history import get_statistics
+
+
+@click.command()
+def stats():
+    """View statistics from your test history.
+    
+    Shows averages, minimums, and maximums for all metrics
+    across your test history.
+    """
+    print_banner()
+    statistics = get_statistics()
+    display_statistics(statistics)
@@ -0,0 +1,35 @@
+"""The `check ttfb` command."""
+
+import click
+from rich.panel import Panel
+
+from ..display import console, format_latency, print_banner, print_error, print_info
+from ..speedtest import run_latency_test
+from . import run_with_progress
+
+
+@click.command()
+def ttfb():
+    """Test Time to First Byte (TTFB).
+    
+    Measures server response time - how quickly you receive
+    the first byte of data after making a request.
+    """
+    print_banner()
+    print_info("Testing Time to First Byte...")
+    console.print()
+    
+    try:
+        result = run_with_progress(run_latency_test, "Testing TTFB")
+        
+        panel = Panel(
+            format_latency(result.ttfb_ms),
+            title="[bold cyan]Time to First Byte (TTFB)[/bold cyan]",
+            border_style="cyan",
+        )
+        console.print(panel)
+        console.print()
+        
+    except Exception as e:
+        print_error(f"TTFB test failed: {e}")
+        raise click.Abort()
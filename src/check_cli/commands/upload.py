@@ -0,0 +1,43 @@
+"""The `check upload` command."""
+
+import click
+
+from ..display import (
+    console,
+    display_result,
+    print_banner,
+    print_error,
+    print_info,
+    progress_session,
+)
+from ..history import History
+from ..speedtest import run_upload_test
+from . import repeat_option, run_with_progress
+
+
+@click.command()
+@click.option("--no-save", is_flag=True, help="Don't save result to history.")
+@repeat_option
+def upload(no_save, repeat):
+    """Test upload speed only.
+    
+    Measures your upload bandwidth by sending data to Cloudflare's servers.
+    """
+    print_banner()
+    print_info("Testing upload speed...")
+    console.print()
+    
+    try:
+        with progress_session() as session:
+            for _ in range(repeat):
+                result = run_with_progress(run_upload_test, "Testing upload", session)
+                
+                if not no_save:
+                    with History() as h:
+                        h.append(result)
+                
+                display_result(result)
+        
+    except Exception as e:
+        print_error(f"Upload test failed: {e}")
+        raise click.Abort()
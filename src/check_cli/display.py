@@ -1,6 +1,11 @@
 """Beautiful terminal output using Rich."""
 
-from typing import Optional
+import sys
+from bisect import bisect_right
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
 
 from rich.console import Console
 from rich.live import Live
@@ -16,10 +21,40 @@ from rich.progress import (
 from rich.table import Table
 from rich.text import Text
 
-from .speedtest import SpeedTestResult
+if TYPE_CHECKING:
+    # Only needed for annotations; importing speedtest pulls in httpx and asyncio
+    from .speedtest import SpeedTestResult
 
 console = Console()
 
+_BANNER_MARKUP = """
+[bold cyan]
+     _____ _               _    
+    / ____| |             | |   
+   | |    | |__   ___  ___| | __
+   | |    | '_ \ / _ \/ __| |/ /
+   | |____| | | |  __/ (__|   < 
+    \_____|_| |_|\___|\___|_|\_\\
+[/bold cyan]
+    [dim]Internet Speed Test Tool[/dim]
+"""
+
+# Static renderables, parsed once at import rather than on every call
+_BANNER = Text.from_markup(_BANNER_MARKUP)
+_RESULT_TITLE = Text.from_markup("[bold cyan]Speed Test Results[/bold cyan]")
+_COMPARISON_TITLE = Text.from_markup("[bold cyan]Speed Test Results (vs Previous)[/bold cyan]")
+_STATISTICS_TITLE = Text.from_markup("[bold cyan]Speed Test Statistics[/bold cyan]")
+
+_EMOJI_QUALITY = "⭐"
+_EMOJI_DOWN = "⬇"
+_EMOJI_UP = "⬆"
+_EMOJI_LATENCY = "⏱"
+_EMOJI_JITTER = "📊"
+_EMOJI_TTFB = "🚀"
+_EMOJI_DNS = "🔍"
+_EMOJI_SERVER = "🌐"
+_EMOJI_IP = "💻"
+
 
 def create_progress() -> Progress:
     """Create a progress bar for speed tests."""
@@ -30,118 +65,159 @@ def create_progress() -> Progress:
         TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
         TimeElapsedColumn(),
         console=console,
+        transient=True,
     )
 
 
-def format_speed(speed: Optional[float], unit: str = "Mbps") -> Text:
-    """Format speed with color based on value."""
-    if speed is None:
-        return Text("N/A", style="dim")
+_TASK_NAMES = {
+    "info": "Getting server info",
+    "latency": "Measuring latency",
+    "rtt": "Measuring TCP RTT",
+    "download": "Testing download",
+    "upload": "Testing upload",
+}
+
+
+@contextmanager
+def progress_session():
+    """Keep one live progress display open across several tests.
+    
+    Yields (progress, new_callback), where new_callback() clears the previous
+    test's bars and returns a progress callback for the next test. Yields None
+    when the console is not a terminal.
+    """
+    if not console.is_terminal:
+        yield None
+        return
     
-    # Color based on speed (for Mbps)
-    if unit == "Mbps":
-        if speed >= 100:
-            style = "bold green"
-        elif speed >= 25:
-            style = "green"
-        elif speed >= 10:
-            style = "yellow"
-        else:
-            style = "red"
-    else:
-        style = "cyan"
+    progress = create_progress()
     
-    return Text(f"{speed:.2f} {unit}", style=style)
+    def new_callback():
+        for task_id in progress.task_ids:
+            progress.remove_task(task_id)
+        tasks = {}
+        
+        def progress_callback(phase: str, value: float, detail: str = ""):
+            task_name = _TASK_NAMES.get(phase, phase)
+            if detail:
+                task_name = f"{task_name} ({detail})"
+            
+            if phase not in tasks:
+                tasks[phase] = progress.add_task(task_name, total=1.0)
+            
+            progress.update(tasks[phase], completed=value, description=task_name)
+        
+        return progress_callback
+    
+    # Tests are network-bound, so a slow refresh is enough and each repaint is cheap
+    with Live(progress, console=console, refresh_per_second=4, transient=True):
+        yield progress, new_callback
+
+
+# Style names shared by every Text built below, interned so that Rich's
+# style parsing cache sees the same string objects across call sites
+_BOLD_GREEN = sys.intern("bold green")
+_GREEN = sys.intern("green")
+_YELLOW = sys.intern("yellow")
+_RED = sys.intern("red")
+_DIM = sys.intern("dim")
+_CYAN = sys.intern("cyan")
+_ORANGE = sys.intern("rgb(255,165,0)")
+
+
+class _ThresholdSpec(NamedTuple):
+    """Threshold ladder for a metric, looked up with bisect."""
+
+    # Ascending; styles has one more entry than thresholds
+    thresholds: Tuple[float, ...]
+    styles: Tuple[str, ...]
+    unit: str
+
+
+_SPEED_SPEC = _ThresholdSpec((10, 25, 100), (_RED, _YELLOW, _GREEN, _BOLD_GREEN), "Mbps")
+_LATENCY_SPEC = _ThresholdSpec((20, 50, 100), (_BOLD_GREEN, _GREEN, _YELLOW, _RED), "ms")
+_JITTER_SPEC = _ThresholdSpec((5, 15, 30), (_BOLD_GREEN, _GREEN, _YELLOW, _RED), "ms")
+_DNS_SPEC = _ThresholdSpec((20, 50, 100), (_BOLD_GREEN, _GREEN, _YELLOW, _RED), "ms")
+_QUALITY_THRESHOLDS = (30, 50, 70, 90)
+_QUALITY_STYLES = (_RED, _ORANGE, _YELLOW, _GREEN, _BOLD_GREEN)
+_QUALITY_LABELS = ("Bad", "Poor", "Fair", "Good", "Excellent")
+
+
+# The cached helpers return (text, style) pairs rather than Text objects,
+# since Text is mutable and must not be shared between renders.
+@lru_cache(maxsize=512)
+def _threshold_parts(value: float, spec: _ThresholdSpec) -> Tuple[str, str]:
+    """Return the label and style for a rounded value under a threshold spec."""
+    return f"{value:.2f} {spec.unit}", spec.styles[bisect_right(spec.thresholds, value)]
+
+
+@lru_cache(maxsize=512)
+def _quality_parts(score: int) -> Tuple[str, str]:
+    """Return the label and style for a quality score."""
+    idx = bisect_right(_QUALITY_THRESHOLDS, score)
+    return f"{score}/100 ({_QUALITY_LABELS[idx]})", _QUALITY_STYLES[idx]
+
+
+@lru_cache(maxsize=512)
+def _change_parts(value: float, is_improvement: bool, unit: str) -> Tuple[str, str]:
+    """Return the label and style for a rounded change value."""
+    arrow = "↑" if value > 0 else "↓"
+    style = _GREEN if is_improvement else _RED
+    return f"{arrow} {abs(value):.2f}{unit}", style
+
+
+def _format_threshold(value: Optional[float], spec: _ThresholdSpec) -> Text:
+    """Format a value with the style of its threshold band."""
+    if value is None:
+        return Text("N/A", style=_DIM)
+    return Text(*_threshold_parts(round(value, 2), spec))
+
+
+def format_speed(speed: Optional[float], unit: str = "Mbps") -> Text:
+    """Format speed with color based on value."""
+    if speed is not None and unit != _SPEED_SPEC.unit:
+        # Thresholds are only defined for Mbps
+        return Text(f"{speed:.2f} {unit}", style=_CYAN)
+    return _format_threshold(speed, _SPEED_SPEC)
 
 
 def format_latency(latency: Optional[float]) -> Text:
     """Format latency with color based on value."""
-    if latency is None:
-        return Text("N/A", style="dim")
-    
-    if latency < 20:
-        style = "bold green"
-    elif latency < 50:
-        style = "green"
-    elif latency < 100:
-        style = "yellow"
-    else:
-        style = "red"
-    
-    return Text(f"{latency:.2f} ms", style=style)
+    return _format_threshold(latency, _LATENCY_SPEC)
 
 
 def format_jitter(jitter: Optional[float]) -> Text:
     """Format jitter with color based on value."""
-    if jitter is None:
-        return Text("N/A", style="dim")
-    
-    if jitter < 5:
-        style = "bold green"
-    elif jitter < 15:
-        style = "green"
-    elif jitter < 30:
-        style = "yellow"
-    else:
-        style = "red"
-    
-    return Text(f"{jitter:.2f} ms", style=style)
+    return _format_threshold(jitter, _JITTER_SPEC)
 
 
 def format_quality_score(score: Optional[int]) -> Text:
     """Format quality score with color and label."""
     if score is None:
-        return Text("N/A", style="dim")
-    
-    if score >= 90:
-        style = "bold green"
-        label = "Excellent"
-    elif score >= 70:
-        style = "green"
-        label = "Good"
-    elif score >= 50:
-        style = "yellow"
-        label = "Fair"
-    elif score >= 30:
-        style = "rgb(255,165,0)"  # Orange
-        label = "Poor"
-    else:
-        style = "red"
-        label = "Bad"
-    
-    return Text(f"{score}/100 ({label})", style=style)
+        return Text("N/A", style=_DIM)
+    return Text(*_quality_parts(score))
 
 
 def format_dns(dns_ms: Optional[float]) -> Text:
     """Format DNS lookup time with color."""
-    if dns_ms is None:
-        return Text("N/A", style="dim")
-    
-    if dns_ms < 20:
-        style = "bold green"
-    elif dns_ms < 50:
-        style = "green"
-    elif dns_ms < 100:
-        style = "yellow"
-    else:
-        style = "red"
-    
-    return Text(f"{dns_ms:.2f} ms", style=style)
+    return _format_threshold(dns_ms, _DNS_SPEC)
 
 
 def format_change(value: float, is_improvement: bool, unit: str = "") -> Text:
     """Format a change value with appropriate color and arrow."""
-    if is_improvement:
-        arrow = "↑" if value > 0 else "↓"
-        style = "green"
-    else:
-        arrow = "↑" if value > 0 else "↓"
-        style = "red"
-    
-    return Text(f"{arrow} {abs(value):.2f}{unit}", style=style)
+    return Text(*_change_parts(round(value, 2), is_improvement, unit))
+
+
+# Per-metric presentation for display_comparison: (emoji, formatter, unit)
+_METRIC_DISPATCH = {
+    "download_mbps": (_EMOJI_DOWN, format_speed, "Mbps"),
+    "upload_mbps": (_EMOJI_UP, format_speed, "Mbps"),
+    "latency_ms": (_EMOJI_LATENCY, format_latency, "ms"),
+    "jitter_ms": (_EMOJI_JITTER, format_jitter, "ms"),
+}
 
 
-def display_result(result: SpeedTestResult) -> None:
+def display_result(result: "SpeedTestResult") -> None:
     """Display a speed test result in a beautiful panel."""
     table = Table(show_header=False, box=None, padding=(0, 2))
     table.add_column("Metric", style="bold")
@@ -149,49 +225,52 @@ def display_result(result: SpeedTestResult) -> None:
     
     # Quality score at the top if available
     if result.quality_score is not None:
-        table.add_row("⭐ Quality Score", format_quality_score(result.quality_score))
+        table.add_row(f"{_EMOJI_QUALITY} Quality Score", format_quality_score(result.quality_score))
         table.add_row("", "")  # Spacer
     
     # Speed metrics
     if result.download_mbps is not None:
-        table.add_row("⬇  Download", format_speed(result.download_mbps))
+        table.add_row(f"{_EMOJI_DOWN}  Download", format_speed(result.download_mbps))
     
     if result.upload_mbps is not None:
-        table.add_row("⬆  Upload", format_speed(result.upload_mbps))
+        table.add_row(f"{_EMOJI_UP}  Upload", format_speed(result.upload_mbps))
     
     table.add_row("", "")  # Spacer
     
     # Latency metrics
     if result.latency_ms is not None:
-        table.add_row("⏱  Latency (idle)", format_latency(result.latency_ms))
+        table.add_row(f"{_EMOJI_LATENCY}  Latency (idle)", format_latency(result.latency_ms))
     
     if result.loaded_latency_ms is not None and result.loaded_latency_ms > 0:
-        table.add_row("⏱  Latency (loaded)", format_latency(result.loaded_latency_ms))
+        table.add_row(f"{_EMOJI_LATENCY}  Latency (loaded)", format_latency(result.loaded_latency_ms))
     
     if result.jitter_ms is not None:
-        table.add_row("📊 Jitter", format_jitter(result.jitter_ms))
+        table.add_row(f"{_EMOJI_JITTER} Jitter", format_jitter(result.jitter_ms))
     
     if result.ttfb_ms is not None and result.ttfb_ms > 0:
-        table.add_row("🚀 TTFB", format_latency(result.ttfb_ms))
+        table.add_row(f"{_EMOJI_TTFB} TTFB", format_latency(result.ttfb_ms))
+    
+    if result.tcp_rtt_ms is not None:
+        table.add_row(f"{_EMOJI_LATENCY}  TCP RTT", format_latency(result.tcp_rtt_ms))
     
     if result.dns_ms is not None and result.dns_ms > 0:
-        table.add_row("🔍 DNS Lookup", format_dns(result.dns_ms))
+        table.add_row(f"{_EMOJI_DNS} DNS Lookup", format_dns(result.dns_ms))
     
     # Add server info
     table.add_row("", "")  # Spacer
     
     if result.server_location:
-        table.add_row("🌐 Server", Text(result.server_location, style="cyan"))
+        table.add_row(f"{_EMOJI_SERVER} Server", Text(result.server_location, style=_CYAN))
     
     if result.client_ip:
-        table.add_row("💻 Your IP", Text(result.client_ip, style="dim"))
+        table.add_row(f"{_EMOJI_IP} Your IP", Text(result.client_ip, style=_DIM))
     
     # Create panel
     panel = Panel(
         table,
-        title="[bold cyan]Speed Test Results[/bold cyan]",
+        title=_RESULT_TITLE,
         subtitle=f"[dim]{result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}[/dim]",
-        border_style="cyan",
+        border_style=_CYAN,
     )
     
     console.print()
@@ -199,25 +278,21 @@ def display_result(result: SpeedTestResult) -> None:
     console.print()
 
 
-def display_comparison(current: SpeedTestResult, comparison: dict) -> None:
+def display_comparison(current: "SpeedTestResult", comparison: dict) -> None:
     """Display current result with comparison to previous."""
     table = Table(show_header=True, box=None, padding=(0, 2))
     table.add_column("Metric", style="bold")
     table.add_column("Current")
-    table.add_column("Previous", style="dim")
+    table.add_column("Previous", style=_DIM)
     table.add_column("Change")
     
     for key, data in comparison.items():
         current_val = data["current"]
         previous_val = data["previous"]
         
-        # Format current value
-        if "latency" in key or "jitter" in key:
-            current_text = format_latency(current_val) if "latency" in key else format_jitter(current_val)
-            previous_text = Text(f"{previous_val:.2f} ms", style="dim")
-        else:
-            current_text = format_speed(current_val)
-            previous_text = Text(f"{previous_val:.2f} Mbps", style="dim")
+        emoji, fmt, unit = _METRIC_DISPATCH[key]
+        current_text = fmt(current_val)
+        previous_text = Text(f"{previous_val:.2f} {unit}", style=_DIM)
         
         # Format change
         change_text = format_change(
@@ -227,7 +302,7 @@ def display_comparison(current: SpeedTestResult, comparison: dict) -> None:
         )
         
         table.add_row(
-            f"{'⬇' if 'download' in key else '⬆' if 'upload' in key else '⏱' if 'latency' in key else '📊'}  {data['name']}",
+            f"{emoji}  {data['name']}",
             current_text,
             previous_text,
             change_text,
@@ -236,15 +311,17 @@ def display_comparison(current: SpeedTestResult, comparison: dict) -> None:
     # Add server info
     table.add_row("", "", "", "")
     if current.server_location:
-        table.add_row("🌐 Server", Text(current.server_location, style="cyan"), "", "")
+        table.add_row(
+            f"{_EMOJI_SERVER} Server", Text(current.server_location, style=_CYAN), "", ""
+        )
     if current.client_ip:
-        table.add_row("💻 Your IP", Text(current.client_ip, style="dim"), "", "")
+        table.add_row(f"{_EMOJI_IP} Your IP", Text(current.client_ip, style=_DIM), "", "")
     
     panel = Panel(
         table,
-        title="[bold cyan]Speed Test Results (vs Previous)[/bold cyan]",
+        title=_COMPARISON_TITLE,
         subtitle=f"[dim]{current.timestamp.strftime('%Y-%m-%d %H:%M:%S')}[/dim]",
-        border_style="cyan",
+        border_style=_CYAN,
     )
     
     console.print()
@@ -252,29 +329,127 @@ def display_comparison(current: SpeedTestResult, comparison: dict) -> None:
     console.print()
 
 
-def display_history(results: list) -> None:
-    """Display history in a table."""
+def _format_column(values, spec: _ThresholdSpec) -> list:
+    """Format a column of history values, styling each by its threshold band."""
+    thresholds, styles = spec.thresholds, spec.styles
+    # %-formatting a lone float is slightly cheaper than an f-string with a format spec
+    return [
+        Text("%.1f" % v, style=styles[bisect_right(thresholds, v)]) if v else "-"
+        for v in values
+    ]
+
+
+def format_speed_column(values) -> list:
+    """Format a column of speeds (Mbps) for the history table."""
+    return _format_column(values, _SPEED_SPEC)
+
+
+def format_latency_column(values) -> list:
+    """Format a column of latencies (ms) for the history table."""
+    return _format_column(values, _LATENCY_SPEC)
+
+
+def format_jitter_column(values) -> list:
+    """Format a column of jitter values (ms) for the history table."""
+    return _format_column(values, _JITTER_SPEC)
+
+
+def _history_fields(result) -> tuple:
+    """Extract the history table fields from a result or raw history dict."""
+    if hasattr(result, "get"):
+        # Raw history record, as returned by get_last_n_records()
+        return (
+            # Stored as isoformat, so "YYYY-MM-DDTHH:MM" is a prefix of it
+            result["timestamp"][:16].replace("T", " "),
+            result.get("download_mbps"),
+            result.get("upload_mbps"),
+            result.get("latency_ms"),
+            result.get("jitter_ms"),
+            result.get("server_location") or "-",
+        )
+    download, upload, latency, jitter, timestamp = result._as_tuple()
+    return (
+        timestamp.strftime("%Y-%m-%d %H:%M"),
+        download,
+        upload,
+        latency,
+        jitter,
+        result.server_location or "-",
+    )
+
+
+def print_cached_render(cache_path: Path, cache_key: str) -> bool:
+    """Write a cached rendering to the console if it was stored under cache_key.
+    
+    Returns False when there is no usable cache entry.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            if f.readline().rstrip("\n") != cache_key:
+                return False
+            output = f.read()
+    except OSError:
+        return False
+    
+    console.file.write(output)
+    console.file.flush()
+    return True
+
+
+def _write_render_cache(cache_path: Path, cache_key: str, output: str) -> None:
+    """Store rendered output under cache_key, ignoring unwritable locations."""
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            f.write(f"{cache_key}\n{output}")
+    except OSError:
+        pass
+
+
+def display_history(
+    results: list, cache_path: Optional[Path] = None, cache_key: str = ""
+) -> None:
+    """Display history in a table.
+    
+    Accepts SpeedTestResult objects or raw history dicts. When cache_path is
+    given, the rendered output is also stored there under cache_key for
+    print_cached_render().
+    """
+    if cache_path is not None:
+        with console.capture() as capture:
+            display_history(results)
+        output = capture.get()
+        _write_render_cache(cache_path, cache_key, output)
+        console.file.write(output)
+        console.file.flush()
+        return
+    
     if not results:
         console.print("[yellow]No history found.[/yellow]")
         return
     
     table = Table(title="Speed Test History", box=None)
-    table.add_column("Date", style="dim")
+    table.add_column("Date", style=_DIM)
     table.add_column("Download", justify="right")
     table.add_column("Upload", justify="right")
     table.add_column("Latency", justify="right")
     table.add_column("Jitter", justify="right")
-    table.add_column("Server", style="cyan")
+    table.add_column("Server", style=_CYAN)
     
-    for result in results:
-        table.add_row(
-            result.timestamp.strftime("%Y-%m-%d %H:%M"),
-            f"{result.download_mbps:.1f}" if result.download_mbps else "-",
-            f"{result.upload_mbps:.1f}" if result.upload_mbps else "-",
-            f"{result.latency_ms:.1f}" if result.latency_ms else "-",
-            f"{result.jitter_ms:.1f}" if result.jitter_ms else "-",
-            result.server_location or "-",
-        )
+    # Split rows into columns so each metric is formatted in one pass
+    dates, downloads, uploads, latencies, jitters, servers = zip(
+        *(_history_fields(r) for r in results)
+    )
+    columns = (
+        dates,
+        format_speed_column(downloads),
+        format_speed_column(uploads),
+        format_latency_column(latencies),
+        format_jitter_column(jitters),
+        servers,
+    )
+    
+    for row in zip(*columns):
+        table.add_row(*row)
     
     console.print()
     console.print(table)
@@ -322,8 +497,8 @@ def display_statistics(stats: dict) -> None:
     
     panel = Panel(
         table,
-        title="[bold cyan]Speed Test Statistics[/bold cyan]",
-        border_style="cyan",
+        title=_STATISTICS_TITLE,
+        border_style=_CYAN,
     )
     
     console.print()
@@ -333,18 +508,7 @@ def display_statistics(stats: dict) -> None:
 
 def print_banner() -> None:
     """Print the check-cli banner."""
-    banner = """
-[bold cyan]
-     _____ _               _    
-    / ____| |             | |   
-   | |    | |__   ___  ___| | __
-   | |    | '_ \ / _ \/ __| |/ /
-   | |____| | | |  __/ (__|   < 
-    \_____|_| |_|\___|\___|_|\_\\
-[/bold cyan]
-    [dim]Internet Speed Test Tool[/dim]
-"""
-    console.print(banner)
+    console.print(_BANNER)
 
 
 def print_error(message: str) -> None:
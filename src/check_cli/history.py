@@ -1,74 +1,263 @@
 """History management for speed test results."""
 
-import json
+import os
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from platformdirs import user_data_dir
 
+from ._json import dumps, loads
 from .speedtest import SpeedTestResult
 
+# Number of results kept by default; reads return at most this many
+_MAX_HISTORY = 100
+# Trim the append-only history file once it grows past this multiple of max_history
+_COMPACT_FACTOR = 2
+# Block size used when scanning backwards for the last record
+_TAIL_BLOCK = 4096
+# Below this many records, importing Numba and building the array costs more
+# than the loop it replaces
+_KERNEL_MIN_RECORDS = 1000
+
 
 def get_history_path() -> Path:
     """Get the path to the history file."""
     data_dir = Path(user_data_dir("check-cli", "check-cli"))
     data_dir.mkdir(parents=True, exist_ok=True)
-    return data_dir / "history.json"
+    return data_dir / "history.jsonl"
 
 
-def load_history() -> List[SpeedTestResult]:
-    """Load history from file."""
+def _get_history_file() -> Path:
+    """Get the history path, migrating the legacy JSON history on first use."""
     history_path = get_history_path()
+    legacy_path = history_path.with_suffix(".json")
+    
+    if not history_path.exists() and legacy_path.exists():
+        try:
+            lines = [dumps(item) + b"\n" for item in loads(legacy_path.read_bytes())]
+        except (ValueError, TypeError):
+            # Keep a damaged file for the user to inspect instead of deleting it
+            legacy_path.replace(legacy_path.with_suffix(".json.bak"))
+        else:
+            with open(history_path, "wb") as f:
+                f.writelines(lines)
+            legacy_path.unlink()
+    
+    return history_path
+
+
+def get_render_cache_path() -> Path:
+    """Get the path to the cached rendering of the history table."""
+    return get_history_path().parent / "history_render.cache"
+
+
+def get_history_fingerprint() -> Optional[str]:
+    """Identify the current history file contents by modification time and size."""
+    history_path = _get_history_file()
+    
+    if not history_path.exists():
+        return None
+    
+    stat = history_path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _parse_raw(lines: Iterable[bytes]) -> List[dict]:
+    """Parse JSON Lines records into dicts, skipping blank or malformed lines."""
+    records = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "timestamp" in record:
+            records.append(record)
+    return records
+
+
+def _parse_lines(lines: Iterable[bytes]) -> List[SpeedTestResult]:
+    """Parse JSON Lines records into results, skipping malformed lines."""
+    results = []
+    for record in _parse_raw(lines):
+        try:
+            results.append(SpeedTestResult.from_dict(record))
+        except (ValueError, TypeError):
+            continue
+    return results
+
+
+def _load_raw(max_history: int = _MAX_HISTORY) -> List[dict]:
+    """Load history as plain dicts, without building SpeedTestResult objects."""
+    history_path = _get_history_file()
     
     if not history_path.exists():
         return []
     
-    try:
-        with open(history_path, "r") as f:
-            data = json.load(f)
-        return [SpeedTestResult.from_dict(item) for item in data]
-    except (json.JSONDecodeError, KeyError, TypeError):
+    # The file may hold up to _COMPACT_FACTOR times more lines than are kept
+    return _parse_raw(history_path.read_bytes().splitlines())[-max_history:]
+
+
+def load_history(max_history: int = _MAX_HISTORY) -> List[SpeedTestResult]:
+    """Load the last max_history results from file."""
+    history_path = _get_history_file()
+    
+    if not history_path.exists():
         return []
+    
+    # The file may hold up to _COMPACT_FACTOR times more lines than are kept
+    return _parse_lines(history_path.read_bytes().splitlines())[-max_history:]
 
 
-def save_result(result: SpeedTestResult, max_history: int = 100) -> None:
-    """Save a result to history, keeping only the last max_history results."""
-    history = load_history()
-    history.append(result)
+def _write_lines(path: Path, results: Iterable[SpeedTestResult], mode: str) -> None:
+    """Write results to the history file, one JSON record per line."""
+    with open(path, mode) as f:
+        f.writelines(r.to_json_bytes() + b"\n" for r in results)
+
+
+class History:
+    """Test history opened for one CLI invocation.
     
-    # Keep only the last max_history results
-    if len(history) > max_history:
-        history = history[-max_history:]
+    The file is parsed at most once, and results added with append() are
+    written when the context exits:
     
-    history_path = get_history_path()
-    with open(history_path, "w") as f:
-        json.dump([r.to_dict() for r in history], f, indent=2)
+        with History() as h:
+            previous = h.last()
+            h.append(result)
+    """
+    
+    def __init__(self, max_history: int = _MAX_HISTORY):
+        self.max_history = max_history
+        self._records: Optional[List[SpeedTestResult]] = None
+        self._pending: List[SpeedTestResult] = []
+    
+    def __enter__(self) -> "History":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    @property
+    def records(self) -> List[SpeedTestResult]:
+        """All results, loaded from disk on first access."""
+        if self._records is None:
+            self._records = (load_history(self.max_history) + self._pending)[-self.max_history:]
+        return self._records
+    
+    def last(self) -> Optional[SpeedTestResult]:
+        """Get the most recent result, reading only the end of the file if needed."""
+        if self._records is not None:
+            return self._records[-1] if self._records else None
+        if self._pending:
+            return self._pending[-1]
+        return get_last_result()
+    
+    def append(self, result: SpeedTestResult) -> None:
+        """Add a result, to be written on save()."""
+        self._pending.append(result)
+        if self._records is not None:
+            self._records.append(result)
+            if len(self._records) > self.max_history:
+                self._records = self._records[-self.max_history:]
+    
+    def save(self) -> None:
+        """Append pending results to the history file.
+        
+        The file is only rewritten once it holds about twice max_history
+        records, judged from its size so that appending never reads it.
+        """
+        if not self._pending:
+            return
+        
+        history_path = _get_history_file()
+        # Records are similar in size, so the latest one stands in for the average
+        record_size = len(self._pending[-1].to_json_bytes()) + 1
+        _write_lines(history_path, self._pending, "ab")
+        self._pending = []
+        
+        if history_path.stat().st_size > record_size * self.max_history * _COMPACT_FACTOR:
+            _write_lines(history_path, self.records, "wb")
+    
+    def close(self) -> None:
+        """Save pending results."""
+        self.save()
+
+
+def save_result(result: SpeedTestResult, max_history: int = _MAX_HISTORY) -> None:
+    """Save a result to history, keeping only the last max_history results."""
+    with History(max_history) as h:
+        h.append(result)
+
+
+def _read_last_line(path: Path) -> bytes:
+    """Read the last non-empty line of a file by scanning backwards from the end."""
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        while pos > 0:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            lines = buf.rstrip(b"\n").rsplit(b"\n", 1)
+            if len(lines) == 2:
+                return lines[1]
+        return buf.rstrip(b"\n")
 
 
 def get_last_result() -> Optional[SpeedTestResult]:
     """Get the most recent result from history."""
+    history_path = _get_history_file()
+    
+    if not history_path.exists():
+        return None
+    
+    results = _parse_lines([_read_last_line(history_path)])
+    if results:
+        return results[0]
+    
+    # The last line is damaged (e.g. an interrupted write); fall back to a full load
     history = load_history()
     return history[-1] if history else None
 
 
-def get_results_since(since: datetime) -> List[SpeedTestResult]:
+def get_results_since(since: datetime, max_history: int = _MAX_HISTORY) -> List[SpeedTestResult]:
     """Get all results since a given datetime."""
-    history = load_history()
+    history = load_history(max_history)
     return [r for r in history if r.timestamp >= since]
 
 
-def get_last_n_results(n: int = 10) -> List[SpeedTestResult]:
+def get_last_n_results(n: int = 10, max_history: int = _MAX_HISTORY) -> List[SpeedTestResult]:
     """Get the last n results."""
-    history = load_history()
-    return history[-n:] if history else []
+    history_path = _get_history_file()
+    
+    if not history_path.exists():
+        return []
+    
+    with open(history_path, "rb") as f:
+        return _parse_lines(deque(f, maxlen=min(n, max_history)))
+
+
+def get_last_n_records(n: int = 10, max_history: int = _MAX_HISTORY) -> List[dict]:
+    """Get the last n results as plain dicts, as stored in the history file."""
+    history_path = _get_history_file()
+    
+    if not history_path.exists():
+        return []
+    
+    with open(history_path, "rb") as f:
+        return _parse_raw(deque(f, maxlen=min(n, max_history)))
 
 
 def clear_history() -> None:
     """Clear all history."""
     history_path = get_history_path()
-    if history_path.exists():
-        history_path.unlink()
+    for path in (history_path, history_path.with_suffix(".json"), get_render_cache_path()):
+        if path.exists():
+            path.unlink()
 
 
 def compare_results(current: SpeedTestResult, previous: SpeedTestResult) -> dict:
@@ -109,27 +298,57 @@ def compare_results(current: SpeedTestResult, previous: SpeedTestResult) -> dict
     return comparison
 
 
-def get_statistics() -> dict:
-    """Get statistics from history."""
-    history = load_history()
+def get_statistics(max_history: int = _MAX_HISTORY) -> dict:
+    """Get statistics from the last max_history results.
+    
+    Pass the max_history the results were saved with to cover long histories.
+    """
+    history = _load_raw(max_history)
     
     if not history:
         return {}
     
     stats = {
         "total_tests": len(history),
-        "first_test": history[0].timestamp.isoformat(),
-        "last_test": history[-1].timestamp.isoformat(),
+        "first_test": history[0]["timestamp"],
+        "last_test": history[-1]["timestamp"],
     }
     
-    # Calculate averages for each metric
     metrics = ["download_mbps", "upload_mbps", "latency_ms", "jitter_ms"]
     
-    for metric in metrics:
-        values = [getattr(r, metric) for r in history if getattr(r, metric) is not None]
-        if values:
-            stats[f"{metric}_avg"] = round(sum(values) / len(values), 2)
-            stats[f"{metric}_min"] = round(min(values), 2)
-            stats[f"{metric}_max"] = round(max(values), 2)
+    acc = None
+    if len(history) >= _KERNEL_MIN_RECORDS:
+        # Imported here: loading Numba takes longer than most history commands
+        from . import _stats_kernel
+        
+        if _stats_kernel.AVAILABLE:
+            acc = dict(zip(metrics, _stats_kernel.reduce_metrics(history, metrics)))
+    if acc is None:
+        acc = _accumulate(history, metrics)
+    
+    for metric, (total, low, high, count) in acc.items():
+        if count:
+            stats[f"{metric}_avg"] = round(total / count, 2)
+            stats[f"{metric}_min"] = round(low, 2)
+            stats[f"{metric}_max"] = round(high, 2)
     
     return stats
+
+
+def _accumulate(history: List[dict], metrics: List[str]) -> dict:
+    """Accumulate [sum, min, max, count] for each metric in a single pass."""
+    acc = {metric: [0.0, float("inf"), float("-inf"), 0] for metric in metrics}
+    
+    for r in history:
+        for metric in metrics:
+            value = r.get(metric)
+            if value is not None:
+                a = acc[metric]
+                a[0] += value
+                if value < a[1]:
+                    a[1] = value
+                if value > a[2]:
+                    a[2] = value
+                a[3] += 1
+    
+    return acc
@@ -1,17 +1,38 @@
 """Core speed test functionality using Cloudflare's speed test infrastructure."""
 
 import asyncio
+import atexit
 import socket
-import statistics
+import struct
+import sys
 import time
-from dataclasses import dataclass, field
+import urllib.request
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import httpx
 
+from ._json import dumps
 
-@dataclass
+# dataclass(slots=True) is only available on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Linux struct tcp_info: tcpi_rtt (smoothed RTT in microseconds) is the
+# 16th u32 after 8 bytes of u8 fields
+_TCP_INFO_AVAILABLE = sys.platform == "linux" and hasattr(socket, "TCP_INFO")
+_TCP_INFO_SIZE = 104
+_TCPI_RTT_OFFSET = 68
+
+# Event loop used by the synchronous run_*_test wrappers, and the clients
+# opened on it, kept for the life of the process so that repeated tests reuse
+# warm connections instead of repeating TCP/TLS handshakes
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_clients: dict = {}
+
+
+@dataclass(**_SLOTS)
 class SpeedTestResult:
     """Results from a speed test."""
 
@@ -23,29 +44,41 @@ class SpeedTestResult:
     loaded_latency_ms: Optional[float] = None  # Latency under load
     ttfb_ms: Optional[float] = None  # Time to first byte
     dns_ms: Optional[float] = None  # DNS lookup time
+    tcp_rtt_ms: Optional[float] = None  # TCP handshake RTT as timed by the kernel
     quality_score: Optional[int] = None  # Overall quality 0-100
     server_location: Optional[str] = None
     server_ip: Optional[str] = None
     client_ip: Optional[str] = None
     isp: Optional[str] = None
+    # Encoded form cached by to_json_bytes(); not part of the result itself
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    # Fields added after the first release, missing from older history entries
+    _LEGACY_FIELDS = ("loaded_latency_ms", "ttfb_ms", "dns_ms", "tcp_rtt_ms", "quality_score")
+
+    def _as_tuple(self) -> tuple:
+        """Return (download_mbps, upload_mbps, latency_ms, jitter_ms, timestamp)."""
+        return self.download_mbps, self.upload_mbps, self.latency_ms, self.jitter_ms, self.timestamp
 
     def to_dict(self) -> dict:
         """Convert result to dictionary for JSON serialization."""
-        return {
-            "timestamp": self.timestamp.isoformat(),
-            "download_mbps": self.download_mbps,
-            "upload_mbps": self.upload_mbps,
-            "latency_ms": self.latency_ms,
-            "jitter_ms": self.jitter_ms,
-            "loaded_latency_ms": self.loaded_latency_ms,
-            "ttfb_ms": self.ttfb_ms,
-            "dns_ms": self.dns_ms,
-            "quality_score": self.quality_score,
-            "server_location": self.server_location,
-            "server_ip": self.server_ip,
-            "client_ip": self.client_ip,
-            "isp": self.isp,
-        }
+        data = {name: getattr(self, name) for name in _FIELD_NAMES}
+        data["timestamp"] = self.timestamp.isoformat()
+        # Measurements are kept at full precision and only rounded for storage
+        for name in _FLOAT_FIELDS:
+            if data[name] is not None:
+                data[name] = round(data[name], 2)
+        return data
+
+    def to_json_bytes(self) -> bytes:
+        """Encode the result as compact JSON, caching the bytes on the instance.
+        
+        Only call this once the result is complete; later changes to its
+        fields are not reflected in the cached bytes.
+        """
+        if self._json is None:
+            self._json = dumps(self.to_dict())
+        return self._json
 
     @classmethod
     def from_dict(cls, data: dict) -> "SpeedTestResult":
@@ -53,40 +86,134 @@ class SpeedTestResult:
         data = data.copy()
         data["timestamp"] = datetime.fromisoformat(data["timestamp"])
         # Handle older history entries that may not have new fields
-        for field_name in ["loaded_latency_ms", "ttfb_ms", "dns_ms", "quality_score"]:
-            if field_name not in data:
-                data[field_name] = None
+        for field_name in cls._LEGACY_FIELDS:
+            data.setdefault(field_name, None)
         return cls(**data)
 
 
+# Serialized fields in declaration order (timestamp first), without the JSON cache
+_FIELD_NAMES = tuple(f.name for f in fields(SpeedTestResult) if f.init)
+
+# Measurement fields, rounded to 2 decimal places when serialized
+_FLOAT_FIELDS = tuple(f.name for f in fields(SpeedTestResult) if f.type == Optional[float])
+
+
+def _proxy_configured() -> bool:
+    """Return True if httpx would send requests to BASE_URL via a proxy."""
+    # httpx (trust_env) reads the same environment variables
+    proxies = urllib.request.getproxies()
+    if not (proxies.get("https") or proxies.get("all")):
+        return False
+    return not urllib.request.proxy_bypass("speed.cloudflare.com")
+
+
+def _latency_stats(samples: List[int]) -> Tuple[float, float]:
+    """Return (average, jitter) in ms for non-empty latency samples in ns.
+    
+    Jitter is the mean absolute difference between consecutive samples.
+    """
+    # Plain sum/len: statistics.mean does exact rational arithmetic on ints
+    n = len(samples)
+    diffs = sum(abs(b - a) for a, b in zip(samples, samples[1:]))
+    jitter = diffs / (n - 1) / 1_000_000 if n > 1 else 0.0
+    return sum(samples) / n / 1_000_000, jitter
+
+
 class CloudflareSpeedTest:
     """Speed test using Cloudflare's infrastructure."""
 
     BASE_URL = "https://speed.cloudflare.com"
-    DOWNLOAD_SIZES = [100_000, 1_000_000, 10_000_000, 25_000_000]  # 100KB, 1MB, 10MB, 25MB
+    # Downloaded concurrently; smaller sizes end before TCP slow start does
+    DOWNLOAD_SIZES = [10_000_000, 25_000_000]  # 10MB, 25MB
     UPLOAD_SIZES = [100_000, 1_000_000, 10_000_000]  # 100KB, 1MB, 10MB
     LATENCY_SAMPLES = 20
+    LATENCY_CONCURRENCY = 4  # Latency samples in flight at once
+    LOADED_PING_INTERVAL = 0.1  # Seconds between pings while downloading
+    KERNEL_CONNECT_TIMEOUT = 2.0  # Seconds to wait for a kernel-timed TCP connect
+    _PROGRESS_INTERVAL_NS = 33_000_000  # Minimum time between progress updates
+
+    # Quality score specs: (result field, weight, value scoring 100%, value scoring 0%)
+    _SCORE_SPECS = (
+        ("download_mbps", 0.40, 100, 0),  # 100+ Mbps = 100%, scales down
+        ("upload_mbps", 0.20, 50, 0),  # 50+ Mbps = 100%, scales down
+        ("latency_ms", 0.25, 10, 200),  # <10ms = 100%, >200ms = 0%
+        ("jitter_ms", 0.15, 5, 50),  # <5ms = 100%, >50ms = 0%
+    )
+
+    # Request headers, shared across calls (httpx does not modify them)
+    _INFO_HEADERS = {"Accept": "*/*"}
+    _PING_HEADERS = {"Accept": "*/*", "Cache-Control": "no-cache"}
+    _DOWN_HEADERS = {"Accept": "*/*", "Cache-Control": "no-cache"}
+    _UP_HEADERS = {"Content-Type": "application/octet-stream", "Cache-Control": "no-cache"}
+
+    # Shared upload payload, allocated on first use and kept for later tests
+    _upload_buffer: Optional[bytes] = None
 
     def __init__(self):
         self.result = SpeedTestResult()
         self._progress_callback = None
+        self._last_report_ns = 0
 
     def set_progress_callback(self, callback):
         """Set a callback function for progress updates."""
         self._progress_callback = callback
 
     def _report_progress(self, phase: str, progress: float, detail: str = ""):
-        """Report progress to callback if set."""
+        """Report progress to callback if set.
+        
+        Intermediate updates are coalesced to at most ~30 per second so that
+        redrawing progress bars does not stall the measurements; the start (0)
+        and end (1) of each phase are always reported.
+        """
         if self._progress_callback:
+            now = time.perf_counter_ns()
+            if 0 < progress < 1 and now - self._last_report_ns < self._PROGRESS_INTERVAL_NS:
+                return
+            self._last_report_ns = now
             self._progress_callback(phase, progress, detail)
 
+    def _new_client(self, timeout: float = 60.0) -> httpx.AsyncClient:
+        """Create an HTTP/2 client with its own connection pool."""
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            http2=True,
+            follow_redirects=True,
+            # Keep idle connections open between phases and tests so they are reused
+            limits=httpx.Limits(
+                max_connections=8,
+                max_keepalive_connections=4,
+                keepalive_expiry=300.0,
+            ),
+        )
+
+    @asynccontextmanager
+    async def _client(self, role: str = "main", timeout: float = 60.0):
+        """Get the client for a role, shared across tests on the shared loop.
+        
+        Roles that run concurrently get separate clients (and connections).
+        When called from another event loop, a fresh client is opened and
+        closed instead.
+        """
+        if asyncio.get_running_loop() is not _loop:
+            async with self._new_client(timeout) as client:
+                yield client
+            return
+        
+        key = (role, timeout)
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = _clients[key] = self._new_client(timeout)
+        yield client
+
     async def measure_dns(self) -> float:
         """Measure DNS lookup time."""
         try:
-            start = time.perf_counter()
-            socket.gethostbyname("speed.cloudflare.com")
-            end = time.perf_counter()
-            return round((end - start) * 1000, 2)
+            # Resolve on the loop's executor so other requests can proceed meanwhile
+            loop = asyncio.get_running_loop()
+            start = time.perf_counter_ns()
+            await loop.getaddrinfo("speed.cloudflare.com", None, type=socket.SOCK_STREAM)
+            end = time.perf_counter_ns()
+            return (end - start) / 1_000_000
         except Exception:
             return 0.0
 
@@ -96,7 +223,7 @@ class CloudflareSpeedTest:
             # Get metadata from Cloudflare
             response = await client.get(
                 f"{self.BASE_URL}/__down?bytes=0",
-                headers={"Accept": "*/*"},
+                headers=self._INFO_HEADERS,
             )
             
             # Extract server info from headers
@@ -123,97 +250,235 @@ class CloudflareSpeedTest:
                 "colo": "Unknown",
             }
 
+    async def measure_latency_kernel(
+        self, host: str = "speed.cloudflare.com", port: int = 443
+    ) -> Optional[list]:
+        """Measure TCP handshake round trips as timed by the kernel.
+        
+        Returns the samples in integer nanoseconds, or None when kernel RTT
+        is not available (non-Linux platforms, or a connection failed, as it
+        may when direct connections are blocked and HTTP goes via a proxy).
+        """
+        if not _TCP_INFO_AVAILABLE:
+            return None
+        
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            return None
+        family, sock_type, proto, _, address = infos[0]
+        semaphore = asyncio.Semaphore(self.LATENCY_CONCURRENCY)
+        failed = False
+        
+        completed = 0
+        
+        async def sample():
+            nonlocal failed, completed
+            async with semaphore:
+                # Give up on the first failure rather than waiting out every sample
+                if failed:
+                    return None
+                sock = socket.socket(family, sock_type, proto)
+                sock.setblocking(False)
+                try:
+                    await asyncio.wait_for(
+                        loop.sock_connect(sock, address), self.KERNEL_CONNECT_TIMEOUT
+                    )
+                    info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, _TCP_INFO_SIZE)
+                except (OSError, asyncio.TimeoutError):
+                    failed = True
+                    return None
+                finally:
+                    sock.close()
+                    completed += 1
+                    self._report_progress("rtt", completed / self.LATENCY_SAMPLES)
+            if len(info) < _TCPI_RTT_OFFSET + 4:
+                return None
+            # The kernel timed SYN -> SYN-ACK itself, free of event loop wakeup delay
+            return struct.unpack_from("I", info, _TCPI_RTT_OFFSET)[0] * 1000
+        
+        samples = await asyncio.gather(*(sample() for _ in range(self.LATENCY_SAMPLES)))
+        if failed:
+            return None
+        samples = [rtt for rtt in samples if rtt]
+        return samples or None
+
+    async def measure_tcp_rtt(self) -> Optional[float]:
+        """Measure the average kernel-timed TCP handshake RTT in ms.
+        
+        Skipped (None) when HTTP requests go through a proxy, since direct
+        connections would then measure a different path, or stall.
+        """
+        if not _TCP_INFO_AVAILABLE or _proxy_configured():
+            return None
+        
+        self._report_progress("rtt", 0, "Measuring TCP RTT...")
+        try:
+            samples = await self.measure_latency_kernel()
+        finally:
+            self._report_progress("rtt", 1, "Done")
+        if not samples:
+            return None
+        return _latency_stats(samples)[0]
+
+    async def _ping(self, client: httpx.AsyncClient) -> int:
+        """Time a zero-byte request up to its response headers, in nanoseconds.
+        
+        The (empty) body is still read after the timestamp is taken, since an
+        HTTP/1.1 connection closed mid-response cannot go back to the pool.
+        """
+        start = time.perf_counter_ns()
+        async with client.stream(
+            "GET",
+            f"{self.BASE_URL}/__down?bytes=0",
+            headers=self._PING_HEADERS,
+        ) as response:
+            first_byte = time.perf_counter_ns()
+            await response.aread()
+        return first_byte - start
+
     async def measure_latency(self, client: httpx.AsyncClient) -> tuple[float, float, float]:
         """Measure latency, jitter, and TTFB using multiple samples."""
+        # Samples are kept as integer nanoseconds and converted to ms at the end
         latencies = []
-        ttfb_values = []
         
-        for i in range(self.LATENCY_SAMPLES):
-            self._report_progress("latency", (i + 1) / self.LATENCY_SAMPLES)
-            try:
-                start = time.perf_counter()
-                response = await client.get(
-                    f"{self.BASE_URL}/__down?bytes=0",
-                    headers={"Accept": "*/*", "Cache-Control": "no-cache"},
-                )
-                first_byte = time.perf_counter()
-                # Consume response
-                _ = response.content
-                end = time.perf_counter()
-                
-                latencies.append((end - start) * 1000)  # Convert to ms
-                ttfb_values.append((first_byte - start) * 1000)
-            except Exception:
-                continue
-            
-            # Small delay between samples
-            await asyncio.sleep(0.05)
+        # Warm up the connection so no sample includes the TCP/TLS handshake
+        concurrency = 1
+        try:
+            response = await client.get(
+                f"{self.BASE_URL}/__down?bytes=0",
+                headers=self._PING_HEADERS,
+            )
+            # Only HTTP/2 lets concurrent samples share the warm connection;
+            # over HTTP/1.1 each extra one would open (and time) a new one
+            if response.http_version == "HTTP/2":
+                concurrency = self.LATENCY_CONCURRENCY
+        except Exception:
+            pass
+        
+        # Keep a few samples in flight at once; the cap stops them queueing
+        # behind each other on the connection
+        semaphore = asyncio.Semaphore(concurrency)
+        completed = 0
+        
+        async def sample():
+            nonlocal completed
+            async with semaphore:
+                try:
+                    return await self._ping(client)
+                except Exception:
+                    return None
+                finally:
+                    completed += 1
+                    self._report_progress("latency", completed / self.LATENCY_SAMPLES)
+        
+        # gather keeps samples in the order they were issued, which jitter relies on
+        for rtt in await asyncio.gather(*(sample() for _ in range(self.LATENCY_SAMPLES))):
+            if rtt is not None:
+                latencies.append(rtt)
         
         if not latencies:
             return 0.0, 0.0, 0.0
         
-        avg_latency = statistics.mean(latencies)
-        avg_ttfb = statistics.mean(ttfb_values) if ttfb_values else 0.0
+        # With an empty body the HTTP round trips are also the TTFB samples
+        # (plain sum/len: statistics.mean does exact rational arithmetic on ints)
+        avg_ttfb = sum(latencies) / len(latencies) / 1_000_000
         
-        # Calculate jitter as average difference between consecutive samples
-        if len(latencies) > 1:
-            differences = [abs(latencies[i] - latencies[i-1]) for i in range(1, len(latencies))]
-            jitter = statistics.mean(differences)
-        else:
-            jitter = 0.0
+        # Jitter is the average difference between consecutive samples
+        avg_latency, jitter = _latency_stats(latencies)
         
-        return round(avg_latency, 2), round(jitter, 2), round(avg_ttfb, 2)
+        return avg_latency, jitter, avg_ttfb
 
     async def measure_download(self, client: httpx.AsyncClient) -> tuple[float, float]:
-        """Measure download speed and loaded latency using multiple file sizes."""
+        """Measure download speed and loaded latency.
+        
+        The DOWNLOAD_SIZES downloads run concurrently, and the speed is the
+        larger of their combined throughput and the fastest single flow.
+        Loaded latency is sampled by pinging alongside the downloads.
+        """
         speeds = []
         loaded_latencies = []
         total_tests = len(self.DOWNLOAD_SIZES)
+        completed = 0
         
-        for idx, size in enumerate(self.DOWNLOAD_SIZES):
-            self._report_progress(
-                "download", 
-                (idx + 1) / total_tests,
-                f"{size // 1_000_000}MB" if size >= 1_000_000 else f"{size // 1000}KB"
-            )
-            
+        # Warm up the connection so the handshake is not counted as download time
+        try:
+            await self._ping(client)
+        except Exception:
+            pass
+        
+        async def download(size):
+            nonlocal completed
+            received = 0
             try:
-                # Measure a small request during the download to get loaded latency
-                start = time.perf_counter()
-                response = await client.get(
+                start = time.perf_counter_ns()
+                async with client.stream(
+                    "GET",
                     f"{self.BASE_URL}/__down?bytes={size}",
-                    headers={"Accept": "*/*", "Cache-Control": "no-cache"},
-                )
-                # Read all content
-                _ = response.content
-                end = time.perf_counter()
+                    headers=self._DOWN_HEADERS,
+                ) as response:
+                    # Count and discard chunks instead of buffering the whole body
+                    async for chunk in response.aiter_raw():
+                        received += len(chunk)
+                end = time.perf_counter_ns()
                 
                 duration = end - start
-                if duration > 0:
-                    # Calculate speed in Mbps
-                    speed_mbps = (size * 8) / (duration * 1_000_000)
-                    speeds.append(speed_mbps)
-                    
-                    # For larger downloads, measure loaded latency
-                    if size >= 1_000_000:
-                        # Quick ping during/after download
-                        ping_start = time.perf_counter()
-                        await client.get(
-                            f"{self.BASE_URL}/__down?bytes=0",
-                            headers={"Accept": "*/*", "Cache-Control": "no-cache"},
-                        )
-                        ping_end = time.perf_counter()
-                        loaded_latencies.append((ping_end - ping_start) * 1000)
+                if duration > 0 and received:
+                    # Calculate speed in Mbps from the bytes actually received
+                    # (bits per nanosecond * 1000 = megabits per second)
+                    speeds.append((received * 8_000) / duration)
             except Exception:
-                continue
+                pass
+            completed += 1
+            self._report_progress(
+                "download",
+                completed / total_tests,
+                f"{size // 1_000_000}MB" if size >= 1_000_000 else f"{size // 1000}KB"
+            )
+            return received
+        
+        async def ping_under_load():
+            while True:
+                try:
+                    loaded_latencies.append(await self._ping(client))
+                except Exception:
+                    pass
+                await asyncio.sleep(self.LOADED_PING_INTERVAL)
+        
+        pinger = asyncio.ensure_future(ping_under_load())
+        try:
+            start = time.perf_counter_ns()
+            received = await asyncio.gather(*(download(size) for size in self.DOWNLOAD_SIZES))
+            duration = time.perf_counter_ns() - start
+        finally:
+            pinger.cancel()
+            try:
+                await pinger
+            except asyncio.CancelledError:
+                pass
         
         if not speeds:
             return 0.0, 0.0
         
-        max_speed = round(max(speeds), 2)
-        avg_loaded_latency = round(statistics.mean(loaded_latencies), 2) if loaded_latencies else 0.0
+        # Concurrent flows share the link, so their combined rate is the line rate
+        if duration > 0:
+            speeds.append((sum(received) * 8_000) / duration)
+        avg_loaded_latency = (
+            sum(loaded_latencies) / len(loaded_latencies) / 1_000_000 if loaded_latencies else 0.0
+        )
         
-        return max_speed, avg_loaded_latency
+        return max(speeds), avg_loaded_latency
+
+    @classmethod
+    def _upload_payload(cls, size: int) -> bytes:
+        """Get a payload of the given size from the shared upload buffer."""
+        buffer = cls._upload_buffer
+        if buffer is None or len(buffer) < size:
+            buffer = cls._upload_buffer = b"x" * max(max(cls.UPLOAD_SIZES), size)
+        # httpx only sends bytes as-is (a memoryview would be iterated), so the
+        # full-size payload is reused directly and smaller ones are sliced
+        return buffer if size == len(buffer) else buffer[:size]
 
     async def measure_upload(self, client: httpx.AsyncClient) -> float:
         """Measure upload speed using multiple payload sizes."""
@@ -227,24 +492,20 @@ class CloudflareSpeedTest:
                 f"{size // 1_000_000}MB" if size >= 1_000_000 else f"{size // 1000}KB"
             )
             
-            # Generate random-ish data for upload
-            data = b"x" * size
+            data = self._upload_payload(size)
             
             try:
-                start = time.perf_counter()
+                start = time.perf_counter_ns()
                 await client.post(
                     f"{self.BASE_URL}/__up",
                     content=data,
-                    headers={
-                        "Content-Type": "application/octet-stream",
-                        "Cache-Control": "no-cache",
-                    },
+                    headers=self._UP_HEADERS,
                 )
-                end = time.perf_counter()
+                end = time.perf_counter_ns()
                 
                 duration = end - start
                 if duration > 0:
-                    speed_mbps = (size * 8) / (duration * 1_000_000)
+                    speed_mbps = (size * 8_000) / duration
                     speeds.append(speed_mbps)
             except Exception:
                 continue
@@ -252,7 +513,7 @@ class CloudflareSpeedTest:
         if not speeds:
             return 0.0
         
-        return round(max(speeds), 2)
+        return max(speeds)
 
     def calculate_quality_score(self) -> int:
         """Calculate an overall connection quality score (0-100).
@@ -265,89 +526,70 @@ class CloudflareSpeedTest:
         """
         score = 0.0
         
-        # Download: 100+ Mbps = 100%, scales down
-        if self.result.download_mbps:
-            dl_score = min(100, (self.result.download_mbps / 100) * 100)
-            score += dl_score * 0.40
-        
-        # Upload: 50+ Mbps = 100%, scales down
-        if self.result.upload_mbps:
-            ul_score = min(100, (self.result.upload_mbps / 50) * 100)
-            score += ul_score * 0.20
-        
-        # Latency: <10ms = 100%, >200ms = 0%
-        if self.result.latency_ms:
-            if self.result.latency_ms <= 10:
-                lat_score = 100
-            elif self.result.latency_ms >= 200:
-                lat_score = 0
-            else:
-                lat_score = 100 - ((self.result.latency_ms - 10) / 190 * 100)
-            score += lat_score * 0.25
-        
-        # Jitter: <5ms = 100%, >50ms = 0%
-        if self.result.jitter_ms:
-            if self.result.jitter_ms <= 5:
-                jit_score = 100
-            elif self.result.jitter_ms >= 50:
-                jit_score = 0
-            else:
-                jit_score = 100 - ((self.result.jitter_ms - 5) / 45 * 100)
-            score += jit_score * 0.15
+        for attr, weight, best, worst in self._SCORE_SPECS:
+            value = getattr(self.result, attr)
+            # Missing (and zero) measurements don't contribute
+            if not value:
+                continue
+            # Linear from 100% at `best` to 0% at `worst`, clamped to 0-100
+            metric_score = (worst - value) / (worst - best) * 100
+            score += max(0.0, min(100.0, metric_score)) * weight
         
         return round(score)
 
     async def run_full_test(self) -> SpeedTestResult:
         """Run a complete speed test (download, upload, latency, jitter)."""
-        # Measure DNS first (before HTTP client)
-        self._report_progress("dns", 0, "Measuring DNS...")
-        self.result.dns_ms = await self.measure_dns()
-        self._report_progress("dns", 1, "Done")
-        
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(60.0, connect=10.0),
-            http2=True,
-            follow_redirects=True,
-        ) as client:
-            # Get server info
+        async with self._client() as client:
+            # Measure DNS and get server info concurrently
+            self._report_progress("dns", 0, "Measuring DNS...")
             self._report_progress("info", 0, "Getting server info...")
-            server_info = await self.get_server_info(client)
+            self.result.dns_ms, server_info = await asyncio.gather(
+                self.measure_dns(),
+                self.get_server_info(client),
+            )
+            self._report_progress("dns", 1, "Done")
             self.result.server_location = server_info["colo"]
             self.result.client_ip = server_info["client_ip"]
             self._report_progress("info", 1, "Done")
             
-            # Measure idle latency and jitter
+            # Measure idle latency and jitter before any load is put on the link
             self._report_progress("latency", 0, "Measuring latency...")
             latency, jitter, ttfb = await self.measure_latency(client)
             self.result.latency_ms = latency
             self.result.jitter_ms = jitter
             self.result.ttfb_ms = ttfb
-            
-            # Measure download and loaded latency
-            self._report_progress("download", 0, "Testing download...")
-            download_speed, loaded_latency = await self.measure_download(client)
-            self.result.download_mbps = download_speed
-            self.result.loaded_latency_ms = loaded_latency
-            
-            # Measure upload
-            self._report_progress("upload", 0, "Testing upload...")
-            self.result.upload_mbps = await self.measure_upload(client)
+        
+        self.result.tcp_rtt_ms = await self.measure_tcp_rtt()
+        
+        # Measure download (with loaded latency) and upload concurrently,
+        # each over its own connection pool
+        self._report_progress("download", 0, "Testing download...")
+        self._report_progress("upload", 0, "Testing upload...")
+        (download_speed, loaded_latency), upload_speed = await asyncio.gather(
+            self._measure_with_client("download", self.measure_download),
+            self._measure_with_client("upload", self.measure_upload),
+        )
+        self.result.download_mbps = download_speed
+        self.result.loaded_latency_ms = loaded_latency
+        self.result.upload_mbps = upload_speed
         
         # Calculate quality score
         self.result.quality_score = self.calculate_quality_score()
         
         return self.result
 
+    async def _measure_with_client(self, role: str, measure):
+        """Run one measurement coroutine on the client for a role."""
+        async with self._client(role) as client:
+            return await measure(client)
+
     async def run_latency_only(self) -> SpeedTestResult:
         """Run only latency/jitter test."""
-        self.result.dns_ms = await self.measure_dns()
-        
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0, connect=10.0),
-            http2=True,
-            follow_redirects=True,
-        ) as client:
-            server_info = await self.get_server_info(client)
+        async with self._client(timeout=30.0) as client:
+            self.result.dns_ms, server_info = await asyncio.gather(
+                self.measure_dns(),
+                self.get_server_info(client),
+            )
             self.result.server_location = server_info["colo"]
             self.result.client_ip = server_info["client_ip"]
             
@@ -356,15 +598,13 @@ class CloudflareSpeedTest:
             self.result.jitter_ms = jitter
             self.result.ttfb_ms = ttfb
         
+        self.result.tcp_rtt_ms = await self.measure_tcp_rtt()
+        
         return self.result
 
     async def run_download_only(self) -> SpeedTestResult:
         """Run only download test."""
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(60.0, connect=10.0),
-            http2=True,
-            follow_redirects=True,
-        ) as client:
+        async with self._client() as client:
             server_info = await self.get_server_info(client)
             self.result.server_location = server_info["colo"]
             self.result.client_ip = server_info["client_ip"]
@@ -377,11 +617,7 @@ class CloudflareSpeedTest:
 
     async def run_upload_only(self) -> SpeedTestResult:
         """Run only upload test."""
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(60.0, connect=10.0),
-            http2=True,
-            follow_redirects=True,
-        ) as client:
+        async with self._client() as client:
             server_info = await self.get_server_info(client)
             self.result.server_location = server_info["colo"]
             self.result.client_ip = server_info["client_ip"]
@@ -391,12 +627,29 @@ class CloudflareSpeedTest:
         return self.result
 
 
+def _run(coro):
+    """Run a coroutine to completion on the shared event loop."""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        atexit.register(_close_shared_loop)
+    return _loop.run_until_complete(coro)
+
+
+def _close_shared_loop():
+    """Close the shared clients and event loop at interpreter exit."""
+    for client in _clients.values():
+        _loop.run_until_complete(client.aclose())
+    _clients.clear()
+    _loop.close()
+
+
 def run_speed_test(progress_callback=None) -> SpeedTestResult:
     """Synchronous wrapper for running a full speed test."""
     tester = CloudflareSpeedTest()
     if progress_callback:
         tester.set_progress_callback(progress_callback)
-    return asyncio.run(tester.run_full_test())
+    return _run(tester.run_full_test())
 
 
 def run_latency_test(progress_callback=None) -> SpeedTestResult:
@@ -404,7 +657,7 @@ def run_latency_test(progress_callback=None) -> SpeedTestResult:
     tester = CloudflareSpeedTest()
     if progress_callback:
         tester.set_progress_callback(progress_callback)
-    return asyncio.run(tester.run_latency_only())
+    return _run(tester.run_latency_only())
 
 
 def run_download_test(progress_callback=None) -> SpeedTestResult:
@@ -412,7 +665,7 @@ def run_download_test(progress_callback=None) -> SpeedTestResult:
     tester = CloudflareSpeedTest()
     if progress_callback:
         tester.set_progress_callback(progress_callback)
-    return asyncio.run(tester.run_download_only())
+    return _run(tester.run_download_only())
 
 
 def run_upload_test(progress_callback=None) -> SpeedTestResult:
@@ -420,4 +673,4 @@ def run_upload_test(progress_callback=None) -> SpeedTestResult:
     tester = CloudflareSpeedTest()
     if progress_callback:
         tester.set_progress_callback(progress_callback)
-    return asyncio.run(tester.run_upload_only())
+    return _run(tester.run_upload_only())
@@ -1,8 +1,18 @@
 """Tests for check-cli."""
 
+import asyncio
+import contextlib
+import http.server
+import json
+import socket
+import socketserver
+import sys
+import threading
+
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from check_cli import history
 from check_cli.speedtest import SpeedTestResult
 from check_cli.history import compare_results
 
@@ -31,6 +41,18 @@ class TestSpeedTestResult:
         assert data["server_location"] == "SJC"
         assert data["client_ip"] == "1.2.3.4"
 
+    def test_to_dict_rounds_measurements(self):
+        """Test that measurements are rounded only when serialized."""
+        result = SpeedTestResult(latency_ms=12.3456, jitter_ms=0.004, quality_score=87)
+        
+        data = result.to_dict()
+        
+        assert data["latency_ms"] == 12.35
+        assert data["jitter_ms"] == 0.0
+        assert data["quality_score"] == 87
+        assert data["download_mbps"] is None
+        assert result.latency_ms == 12.3456
+
     def test_from_dict(self):
         """Test creation from dictionary."""
         data = {
@@ -143,6 +165,410 @@ class TestCompareResults:
         assert comparison["download_mbps"]["percent_change"] == 50.0
 
 
+@pytest.fixture
+def history_path(tmp_path, monkeypatch):
+    """Point history storage at a temporary file."""
+    path = tmp_path / "history.jsonl"
+    monkeypatch.setattr(history, "get_history_path", lambda: path)
+    return path
+
+
+@contextlib.contextmanager
+def http11_server():
+    """Serve empty HTTP/1.1 responses locally, yielding (base_url, connections)."""
+    connections = []
+    
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+        
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    with socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            yield "http://127.0.0.1:%d" % server.server_address[1], connections
+        finally:
+            server.shutdown()
+
+
+def make_result(day: int, download: float = 100.0) -> SpeedTestResult:
+    """Create a result for the given day of January 2024."""
+    return SpeedTestResult(
+        timestamp=datetime(2024, 1, day, 12, 0, 0),
+        download_mbps=download,
+        upload_mbps=50.0,
+        latency_ms=15.0,
+        jitter_ms=2.0,
+    )
+
+
+class TestCloudflareSpeedTest:
+    """Tests for the speed test measurements."""
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="TCP_INFO is Linux-only")
+    def test_kernel_latency_samples(self):
+        """Test kernel RTT samples from TCP handshakes to a local listener."""
+        from check_cli.speedtest import CloudflareSpeedTest
+        
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(32)
+            host, port = server.getsockname()
+            
+            tester = CloudflareSpeedTest()
+            samples = asyncio.run(tester.measure_latency_kernel(host, port))
+        
+        assert len(samples) == tester.LATENCY_SAMPLES
+        # Loopback round trips are well under a second but never zero
+        assert all(0 < rtt < 1_000_000_000 for rtt in samples)
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="TCP_INFO is Linux-only")
+    def test_kernel_latency_gives_up_on_failed_connect(self):
+        """Test that a refused connection falls back instead of retrying every sample."""
+        from check_cli.speedtest import CloudflareSpeedTest
+        
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            host, port = unused.getsockname()
+        
+        assert asyncio.run(CloudflareSpeedTest().measure_latency_kernel(host, port)) is None
+
+    def test_tcp_rtt_skipped_behind_proxy(self, monkeypatch):
+        """Test that the kernel RTT phase is skipped when HTTP goes via a proxy."""
+        from check_cli.speedtest import CloudflareSpeedTest
+        
+        monkeypatch.setenv("HTTPS_PROXY", "http://127.0.0.1:3128")
+        monkeypatch.delenv("NO_PROXY", raising=False)
+        monkeypatch.delenv("no_proxy", raising=False)
+        
+        tester = CloudflareSpeedTest()
+        
+        async def unexpected_kernel_rtt():
+            raise AssertionError("direct connections attempted behind a proxy")
+        
+        monkeypatch.setattr(tester, "measure_latency_kernel", unexpected_kernel_rtt)
+        
+        assert asyncio.run(tester.measure_tcp_rtt()) is None
+
+    def test_pings_reuse_http11_connection(self):
+        """Test that zero-byte pings return HTTP/1.1 connections to the pool."""
+        from check_cli.speedtest import CloudflareSpeedTest
+        
+        with http11_server() as (base_url, connections):
+            tester = CloudflareSpeedTest()
+            tester.BASE_URL = base_url
+            
+            async def ping_repeatedly():
+                async with tester._new_client() as client:
+                    return [await tester._ping(client) for _ in range(5)]
+            
+            samples = asyncio.run(ping_repeatedly())
+        
+        assert all(rtt > 0 for rtt in samples)
+        assert len(connections) == 1
+
+    def test_latency_samples_use_one_http11_connection(self):
+        """Test that latency samples are taken serially without HTTP/2."""
+        from check_cli.speedtest import CloudflareSpeedTest
+        
+        with http11_server() as (base_url, connections):
+            tester = CloudflareSpeedTest()
+            tester.BASE_URL = base_url
+            
+            async def measure():
+                async with tester._new_client() as client:
+                    return await tester.measure_latency(client)
+            
+            latency, jitter, ttfb = asyncio.run(measure())
+        
+        assert latency > 0
+        assert len(connections) == 1
+
+    @pytest.mark.parametrize(
+        "fields, expected",
+        [
+            # Latency: full weight at or under 10 ms, nothing from 200 ms
+            ({"latency_ms": 5}, 25),
+            ({"latency_ms": 10}, 25),
+            ({"latency_ms": 200}, 0),
+            ({"latency_ms": 400}, 0),
+            # Jitter: full weight at or under 5 ms, nothing from 50 ms
+            ({"jitter_ms": 5}, 15),
+            ({"jitter_ms": 50}, 0),
+            # Speeds clamp at 100 Mbps down and 50 Mbps up
+            ({"download_mbps": 100}, 40),
+            ({"download_mbps": 1000}, 40),
+            ({"download_mbps": 50}, 20),
+            ({"upload_mbps": 50}, 20),
+            ({"upload_mbps": 500}, 20),
+            # Zero or missing values contribute nothing
+            ({"download_mbps": 0, "upload_mbps": 0, "latency_ms": 0, "jitter_ms": 0}, 0),
+            ({}, 0),
+            ({"download_mbps": 100, "upload_mbps": 50, "latency_ms": 10, "jitter_ms": 5}, 100),
+        ],
+    )
+    def test_quality_score_boundaries(self, fields, expected):
+        """Test quality score weights and clamping at each metric's boundaries."""
+        from check_cli.speedtest import CloudflareSpeedTest, SpeedTestResult
+        
+        tester = CloudflareSpeedTest()
+        tester.result = SpeedTestResult(**fields)
+        
+        assert tester.calculate_quality_score() == expected
+
+    def test_progress_is_throttled(self):
+        """Test that rapid progress updates are coalesced but ends are kept."""
+        from check_cli.speedtest import CloudflareSpeedTest
+        
+        events = []
+        tester = CloudflareSpeedTest()
+        tester.set_progress_callback(lambda phase, value, detail: events.append(value))
+        
+        tester._report_progress("latency", 0)
+        for i in range(1, 20):
+            tester._report_progress("latency", i / 20)
+        tester._report_progress("latency", 1)
+        
+        assert events[0] == 0
+        assert events[-1] == 1
+        assert len(events) < 21
+
+    def test_clients_are_reused_across_runs(self):
+        """Test that synchronous runs share clients through the shared loop."""
+        from check_cli import speedtest
+        
+        async def get_client():
+            async with speedtest.CloudflareSpeedTest()._client() as client:
+                return client
+        
+        first = speedtest._run(get_client())
+        second = speedtest._run(get_client())
+        
+        assert first is second
+        assert not first.is_closed
+        # Outside the shared loop each call gets its own client, closed afterwards
+        other = asyncio.run(get_client())
+        assert other is not first
+        assert other.is_closed
+
+    def test_latency_stats(self):
+        """Test latency average and jitter from nanosecond samples."""
+        from check_cli.speedtest import _latency_stats
+        
+        samples = [10_000_000, 12_000_000, 9_000_000, 15_000_000]
+        expected = (11.5, 11 / 3)
+        
+        assert _latency_stats(samples) == pytest.approx(expected)
+        assert _latency_stats(samples[:1]) == (10.0, 0.0)
+
+
+class TestHistory:
+    """Tests for history storage."""
+
+    def test_save_appends_lines(self, history_path):
+        """Test that each saved result is a single JSON line."""
+        history.save_result(make_result(1))
+        history.save_result(make_result(2))
+        
+        lines = history_path.read_text().splitlines()
+        
+        assert len(lines) == 2
+        assert json.loads(lines[1])["timestamp"] == "2024-01-02T12:00:00"
+
+    def test_last_results(self, history_path):
+        """Test reading the most recent results."""
+        for day in range(1, 6):
+            history.save_result(make_result(day, download=float(day)))
+        
+        assert history.get_last_result().download_mbps == 5.0
+        assert [r.download_mbps for r in history.get_last_n_results(2)] == [4.0, 5.0]
+        assert len(history.load_history()) == 5
+
+    def test_compaction(self, history_path):
+        """Test that the file is trimmed once it exceeds twice max_history."""
+        for day in range(1, 8):
+            history.save_result(make_result(day), max_history=3)
+        
+        results = history.load_history()
+        
+        assert len(history_path.read_text().splitlines()) == 3
+        assert len(results) == 3
+        assert results[-1].timestamp == datetime(2024, 1, 7, 12, 0, 0)
+
+    def test_reads_are_limited_to_max_history(self, history_path):
+        """Test that reads keep max_history results before the file is compacted."""
+        start = datetime(2024, 1, 1)
+        for hour in range(150):
+            history.save_result(SpeedTestResult(timestamp=start + timedelta(hours=hour)))
+        
+        assert len(history_path.read_text().splitlines()) == 150
+        assert len(history.load_history()) == 100
+        assert history.load_history()[0].timestamp == start + timedelta(hours=50)
+        assert history.get_statistics()["total_tests"] == 100
+        assert len(history.get_last_n_results(500)) == 100
+        with history.History() as h:
+            assert len(h.records) == 100
+
+    def test_migrates_legacy_json(self, history_path):
+        """Test conversion of an old history.json file."""
+        legacy_path = history_path.with_suffix(".json")
+        legacy_path.write_text(json.dumps([make_result(1).to_dict(), make_result(2).to_dict()]))
+        
+        results = history.load_history()
+        
+        assert len(results) == 2
+        assert history_path.exists()
+        assert not legacy_path.exists()
+
+    def test_keeps_damaged_legacy_json(self, history_path):
+        """Test that an unreadable history.json is kept as a backup, not deleted."""
+        legacy_path = history_path.with_suffix(".json")
+        legacy_path.write_text('[{"timestamp": "2024-01-')
+        
+        assert history.load_history() == []
+        assert not legacy_path.exists()
+        assert legacy_path.with_suffix(".json.bak").read_text() == '[{"timestamp": "2024-01-'
+
+    def test_skips_damaged_lines(self, history_path):
+        """Test that a truncated last line does not hide earlier results."""
+        history.save_result(make_result(1))
+        with open(history_path, "a") as f:
+            f.write('{"timestamp": "2024-01-')
+        
+        assert len(history.load_history()) == 1
+        assert history.get_last_result().timestamp == datetime(2024, 1, 1, 12, 0, 0)
+
+    def test_statistics(self, history_path):
+        """Test averages, minimums and maximums across history."""
+        for day, download in ((1, 50.0), (2, 100.0), (3, 150.0)):
+            history.save_result(make_result(day, download=download))
+        history.save_result(SpeedTestResult(timestamp=datetime(2024, 1, 4)))
+        
+        stats = history.get_statistics()
+        
+        assert stats["total_tests"] == 4
+        assert stats["download_mbps_avg"] == 100.0
+        assert stats["download_mbps_min"] == 50.0
+        assert stats["download_mbps_max"] == 150.0
+        assert stats["last_test"] == "2024-01-04T00:00:00"
+
+    def test_history_context(self, history_path):
+        """Test that History writes appended results on exit."""
+        history.save_result(make_result(1))
+        
+        with history.History() as h:
+            assert h.last().timestamp == datetime(2024, 1, 1, 12, 0, 0)
+            h.append(make_result(2))
+            assert h.last().timestamp == datetime(2024, 1, 2, 12, 0, 0)
+            assert len(history.load_history()) == 1
+        
+        assert len(history.load_history()) == 2
+
+    def test_history_last_reads_only_the_tail(self, history_path, monkeypatch):
+        """Test that History.last() does not parse the whole file."""
+        history.save_result(make_result(1))
+        history.save_result(make_result(2))
+        
+        with history.History() as h:
+            monkeypatch.setattr(history, "load_history", lambda *args: pytest.fail("full load"))
+            assert h.last().timestamp == datetime(2024, 1, 2, 12, 0, 0)
+            h.append(make_result(3))
+            assert h.last().timestamp == datetime(2024, 1, 3, 12, 0, 0)
+        
+        assert history.get_last_result().timestamp == datetime(2024, 1, 3, 12, 0, 0)
+
+    def test_statistics_uses_kernel_for_long_history(self, history_path, monkeypatch):
+        """Test that get_statistics reduces long histories with the compiled kernel."""
+        pytest.importorskip("numba")
+        from check_cli import _stats_kernel
+        
+        calls = []
+        reduce_metrics = _stats_kernel.reduce_metrics
+        monkeypatch.setattr(
+            _stats_kernel,
+            "reduce_metrics",
+            lambda records, metrics: calls.append(len(records)) or reduce_metrics(records, metrics),
+        )
+        start = datetime(2024, 1, 1)
+        with history.History(max_history=2000) as h:
+            for hour in range(1200):
+                h.append(SpeedTestResult(timestamp=start + timedelta(hours=hour), download_mbps=float(hour)))
+        
+        stats = history.get_statistics(max_history=2000)
+        
+        assert calls == [1200]
+        assert stats["total_tests"] == 1200
+        assert stats["download_mbps_min"] == 0.0
+        assert stats["download_mbps_max"] == 1199.0
+        assert stats["download_mbps_avg"] == 599.5
+        assert history.get_statistics()["total_tests"] == 100
+
+    def test_statistics_kernel_matches_loop(self):
+        """Test that the compiled reduction agrees with the pure-Python loop."""
+        pytest.importorskip("numba")
+        from check_cli import _stats_kernel
+        
+        metrics = ["download_mbps", "upload_mbps", "latency_ms", "jitter_ms"]
+        records = [
+            {"download_mbps": float(i), "upload_mbps": None if i % 2 else 5.0, "jitter_ms": None}
+            for i in range(10)
+        ]
+        
+        expected = list(history._accumulate(records, metrics).values())
+        
+        assert _stats_kernel.reduce_metrics(records, metrics) == expected
+
+
+class TestFormatters:
+    """Tests for display formatting helpers."""
+
+    def test_latency_thresholds(self):
+        """Test latency styles at threshold boundaries."""
+        from check_cli.display import format_latency
+        
+        assert format_latency(19.99).style == "bold green"
+        assert format_latency(20.0).style == "green"
+        assert format_latency(99.0).style == "yellow"
+        assert format_latency(100.0).style == "red"
+        assert format_latency(None).plain == "N/A"
+
+    def test_speed_thresholds(self):
+        """Test speed styles and labels."""
+        from check_cli.display import format_speed
+        
+        assert format_speed(100.0).style == "bold green"
+        assert format_speed(9.5).style == "red"
+        assert format_speed(12.345).plain == "12.35 Mbps"
+        assert format_speed(5.0, "MB/s").style == "cyan"
+
+    def test_quality_score_labels(self):
+        """Test quality score labels."""
+        from check_cli.display import format_quality_score
+        
+        assert format_quality_score(95).plain == "95/100 (Excellent)"
+        assert format_quality_score(30).plain == "30/100 (Poor)"
+        assert format_quality_score(10).plain == "10/100 (Bad)"
+
+    def test_cached_text_not_shared(self):
+        """Test that formatters return independent Text objects."""
+        from check_cli.display import format_jitter
+        
+        first = format_jitter(3.0)
+        first.append(" extra")
+        
+        assert format_jitter(3.0).plain == "3.00 ms"
+
+
 class TestCLI:
     """Tests for CLI commands."""
 
@@ -170,3 +596,76 @@ class TestCLI:
         assert "download" in result.output
         assert "upload" in result.output
         assert "latency" in result.output
+
+    def test_history_command(self, history_path):
+        """Test the history command output."""
+        from click.testing import CliRunner
+        from check_cli.main import cli
+        
+        history.save_result(make_result(1, download=123.4))
+        
+        runner = CliRunner()
+        result = runner.invoke(cli, ["history", "-n", "5"])
+        
+        assert result.exit_code == 0
+        assert "2024-01-01 12:00" in result.output
+        assert "123.4" in result.output
+
+    def test_history_rejects_non_positive_count(self, history_path):
+        """Test that -n must be at least 1."""
+        from click.testing import CliRunner
+        from check_cli.main import cli
+        
+        history.save_result(make_result(1))
+        
+        result = CliRunner().invoke(cli, ["history", "-n", "-1"])
+        
+        assert result.exit_code == 2
+        assert "Invalid value" in result.output
+
+    def test_repeat_runs_test_and_saves_each_result(self, history_path, monkeypatch):
+        """Test that --repeat runs the test that many times, saving each result."""
+        from click.testing import CliRunner
+        from check_cli.main import cli
+        from check_cli.speedtest import SpeedTestResult
+        
+        calls = []
+        
+        def fake_latency_test(progress_callback=None):
+            calls.append(progress_callback)
+            return SpeedTestResult(latency_ms=12.0, jitter_ms=1.0)
+        
+        monkeypatch.setattr("check_cli.commands.latency.run_latency_test", fake_latency_test)
+        
+        runner = CliRunner()
+        result = runner.invoke(cli, ["latency", "--repeat", "2"])
+        
+        assert result.exit_code == 0
+        assert len(calls) == 2
+        assert len(history_path.read_text().splitlines()) == 2
+        
+        result = runner.invoke(cli, ["latency", "--repeat", "0"])
+        
+        assert result.exit_code == 2
+        assert "Invalid value" in result.output
+        assert len(calls) == 2
+
+    def test_history_command_uses_render_cache(self, history_path):
+        """Test that unchanged history is replayed from the render cache."""
+        from click.testing import CliRunner
+        from check_cli.main import cli
+        
+        history.save_result(make_result(1, download=123.4))
+        runner = CliRunner()
+        
+        first = runner.invoke(cli, ["history"])
+        cache_path = history.get_render_cache_path()
+        key, _ = cache_path.read_text(encoding="utf-8").split("\n", 1)
+        cache_path.write_text(f"{key}\nCACHED\n", encoding="utf-8")
+        second = runner.invoke(cli, ["history"])
+        history.save_result(make_result(2, download=99.9))
+        third = runner.invoke(cli, ["history"])
+        
+        assert "123.4" in first.output
+        assert "CACHED" in second.output
+        assert "99.9" in third.output